@@ -1,6 +1,9 @@
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
+import os
 
-MANUFACTURER_DIRS = (
+MANUFACTURER_DIRS: frozenset[str] = frozenset({
     "Acura",
     "Audi",
     "BMW",
@@ -15,7 +18,40 @@ MANUFACTURER_DIRS = (
     "Subaru",
     "Tesla",
     "Toyota",
-)
+})
 
-def available_apps(base_path: Path = Path(__file__).resolve().parents[1]) -> list[str]:
-    return [name for name in MANUFACTURER_DIRS if (base_path / name).exists()]
+@lru_cache(maxsize=8)
+def _scan_apps(
+    base_path: Path,
+    dir_mtimes: tuple[tuple[str, int], ...],
+) -> tuple[tuple[str, frozenset[str]], ...]:
+    # dir_mtimes only keys the cache: adding or removing a file inside an app
+    # directory changes that directory's mtime, so the listing is rebuilt
+    apps = []
+    for name, _ in dir_mtimes:
+        with os.scandir(base_path / name) as files:
+            apps.append((name, frozenset(f.name for f in files if f.is_file())))
+    return tuple(apps)
+
+
+def scan_apps(base_path: Path) -> tuple[tuple[str, frozenset[str]], ...]:
+    try:
+        with os.scandir(base_path) as entries:
+            dir_mtimes = tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in entries
+                if entry.name in MANUFACTURER_DIRS and entry.is_dir()
+            ))
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+    return _scan_apps(base_path, dir_mtimes)
+
+
+def available_apps(base_path: Path = Path(__file__).resolve().parents[1]) -> tuple[str, ...]:
+    return tuple(name for name, _ in scan_apps(base_path))
+
+
+def iter_app_csvs(base_path: Path, csv_name: str) -> Iterator[tuple[str, Path]]:
+    for name, files in scan_apps(base_path):
+        if csv_name in files:
+            yield name, base_path / name / csv_name
@@ -1,7 +1,14 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import logging
+import sys
+import matplotlib
+matplotlib.use('Agg')
 from utils import application_permissions, trackers, certificate_analysis, network_analysis, pni_scoring, code_analysis, manifest_analysis
 
 BASE_PATH = Path(__file__).resolve().parents[1]
+# module level so worker processes that re-import this module log too
+logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
 SUBSCRIPTS = (
     ("trackers", trackers.generate_tracker_report),
     ("application_permissions", application_permissions.generate_permissions_reports),
@@ -13,9 +20,15 @@ SUBSCRIPTS = (
 )
 
 def run_subscripts(base_path: Path = BASE_PATH) -> None:
-    for name, runner in SUBSCRIPTS:
-        print(f"Running {name} analysis...")
-        runner(base_path=base_path)
+    # subscripts read disjoint CSVs and write disjoint output dirs, so they run side by side
+    with ProcessPoolExecutor(max_workers=len(SUBSCRIPTS)) as executor:
+        futures = {}
+        for name, runner in SUBSCRIPTS:
+            print(f"Running {name} analysis...")
+            futures[executor.submit(runner, base_path=base_path)] = name
+        for future in as_completed(futures):
+            future.result()
+            print(f"Finished {futures[future]} analysis")
 
 def main() -> int:
     run_subscripts()
@@ -1,13 +1,16 @@
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import Iterable
 import sys
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.figure import Figure
 from matplotlib.ticker import MaxNLocator
-from apps import available_apps
-from utils import scoring
+from apps import iter_app_csvs
+from utils.charts import reset_figure, save_figure
+from utils.paths import ensure_dir
+from utils.loaders import summarize_manufacturer
 
 SRC_PATH = Path(__file__).resolve().parents[1]
 PROJECT_ROOT = SRC_PATH.parent
@@ -18,101 +21,65 @@ if str(SRC_PATH) not in sys.path:
 
 CSV_NAME = "application_permissions.csv"
 DEFAULT_BASE_PATH = PROJECT_ROOT
-COLUMN_CANDIDATES: tuple[str, ...] = (
-    "STATUS",
-    "status",
-    "Status",
-    "SEVERITY",
-    "severity",
-    "Severity",
-)
+SUMMARY_COLUMNS: tuple[str, ...] = ("manufacturer", "high", "medium", "normal", "total_permissions", "score")
 COLOR_NORMAL = "#c7c9d3"
 COLOR_MEDIUM = "#ffb347"
 COLOR_HIGH = "#ff5c5c"
 
 
 def prepare_output_path(path: Path) -> Path:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists():
-        path.unlink()
+    ensure_dir(path.parent)
+    path.unlink(missing_ok=True)
     return path
 
-def find_status_column(frame: pd.DataFrame) -> str | None:
-    for candidate in COLUMN_CANDIDATES:
-        if candidate in frame.columns:
-            return candidate
-    return None
-
-def summarize_manufacturer(csv_path: Path) -> dict[str, int | str] | None:
-    dataframe = pd.read_csv(csv_path)
-    column = find_status_column(dataframe)
-    if column is None:
-        return None
-    summary = scoring.summarize_risks(dataframe[column])
-    manufacturer = csv_path.parent.name
-    return {
-        "manufacturer": manufacturer,
-        "high": int(summary.get("high", 0)),
-        "medium": int(summary.get("medium", 0)),
-        "normal": int(summary.get("normal", 0)),
-        "total_permissions": int(summary.get("total", 0)),
-        "score": int(summary.get("score", 0)),
-    }
-
 def collect_permission_summaries(
     base_path: Path = DEFAULT_BASE_PATH,
-) -> list[dict[str, int | str]]:
-    summaries: list[dict[str, int | str]] = []
-    for app in available_apps(base_path):
-        csv_path = base_path / app / CSV_NAME
-        if not csv_path.exists():
-            continue
+) -> dict[str, list[int | str]]:
+    # one list per column rather than one dict per manufacturer
+    columns: dict[str, list[int | str]] = {name: [] for name in SUMMARY_COLUMNS}
+    for _, csv_path in iter_app_csvs(base_path, CSV_NAME):
         summary = summarize_manufacturer(csv_path)
         if summary is None:
             continue
-        summaries.append(summary)
-    return summaries
-
-def summaries_to_frame(summaries: Iterable[dict[str, int | str]]) -> pd.DataFrame:
-    frame = pd.DataFrame(list(summaries))
-    if frame.empty:
-        return frame
-    return frame.sort_values("manufacturer").reset_index(drop=True)
+        for name in SUMMARY_COLUMNS:
+            columns[name].append(summary[name])
+    return columns
+
+def summaries_to_frame(summaries: Mapping[str, Sequence[int | str]]) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "manufacturer": list(summaries["manufacturer"]),
+            **{name: np.asarray(summaries[name], dtype=np.int32) for name in SUMMARY_COLUMNS[1:]},
+        }
+    )
+    return frame.sort_values("manufacturer", kind="stable").reset_index(drop=True)
 
-def plot_stacked_bar(frame: pd.DataFrame, output_path: Path) -> Path:
+def plot_stacked_bar(frame: pd.DataFrame, output_path: Path, fig: Figure | None = None) -> Path:
     prepare_output_path(output_path)
     manufacturers = frame["manufacturer"].tolist()
-    normal = frame["normal"].tolist()
-    medium = frame["medium"].tolist()
-    high = frame["high"].tolist()
+    vals_matrix = frame[["normal", "medium", "high"]].to_numpy(dtype=np.int64).T
+    bottoms = np.vstack([np.zeros(len(manufacturers), dtype=np.int64), vals_matrix[:-1].cumsum(axis=0)])
     x_positions = list(range(len(manufacturers)))
 
-    fig, ax = plt.subplots(figsize=(max(8, len(manufacturers) * 0.9), 5.5))
-    ax.bar(x_positions, normal, label="Normal", color=COLOR_NORMAL)
-    ax.bar(x_positions, medium, bottom=normal, label="Medium", color=COLOR_MEDIUM)
-    ax.bar(
-        x_positions,
-        high,
-        bottom=(frame["normal"] + frame["medium"]).tolist(),
-        label="High",
-        color=COLOR_HIGH,
-    )
+    chart_fig, ax = reset_figure(fig, (max(8, len(manufacturers) * 0.9), 5.5))
+    layers = (("Normal", COLOR_NORMAL), ("Medium", COLOR_MEDIUM), ("High", COLOR_HIGH))
+    for i, (label, color) in enumerate(layers):
+        ax.bar(x_positions, vals_matrix[i], bottom=bottoms[i], label=label, color=color, rasterized=True)
     ax.set_xticks(x_positions, manufacturers, rotation=45, ha="right")
     ax.set_ylabel("Permissions count")
     ax.set_title("Application permission risk mix by manufacturer")
     ax.yaxis.set_major_locator(MaxNLocator(integer=True))
     ax.legend(loc="upper right")
     ax.grid(axis="y", linestyle="--", alpha=0.4)
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
-def plot_score_bars(frame: pd.DataFrame, output_path: Path) -> Path:
+def plot_score_bars(frame: pd.DataFrame, output_path: Path, fig: Figure | None = None) -> Path:
     ordered = frame.sort_values("score", ascending=False)
     prepare_output_path(output_path)
-    fig, ax = plt.subplots(figsize=(8, max(4, len(ordered) * 0.5)))
-    bars = ax.barh(ordered["manufacturer"], ordered["score"], color="#4c72b0")
+    chart_fig, ax = reset_figure(fig, (8, max(4, len(ordered) * 0.5)))
+    bars = ax.barh(ordered["manufacturer"], ordered["score"], color="#4c72b0", rasterized=True)
     ax.set_xlabel("Risk score (High=2, Medium=1)")
     ax.set_ylabel("Manufacturer")
     ax.set_title("Total application permission risk score")
@@ -127,12 +94,11 @@ def plot_score_bars(frame: pd.DataFrame, output_path: Path) -> Path:
             va="center",
             fontsize=8,
         )
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
-def plot_risk_pie(frame: pd.DataFrame, output_path: Path) -> Path:
+def plot_risk_pie(frame: pd.DataFrame, output_path: Path, fig: Figure | None = None) -> Path:
     total_high = int(frame["high"].sum())
     total_medium = int(frame["medium"].sum())
     total_normal = int(frame["normal"].sum())
@@ -143,7 +109,7 @@ def plot_risk_pie(frame: pd.DataFrame, output_path: Path) -> Path:
         raise ValueError("No permission data available for pie chart")
 
     prepare_output_path(output_path)
-    fig, ax = plt.subplots(figsize=(5.5, 5.5))
+    chart_fig, ax = reset_figure(fig, (5.5, 5.5))
     ax.pie(
         totals,
         labels=labels,
@@ -152,9 +118,8 @@ def plot_risk_pie(frame: pd.DataFrame, output_path: Path) -> Path:
         startangle=140,
     )
     ax.set_title("Risk distribution across all permissions")
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
 def save_summary_csv(frame: pd.DataFrame, output_path: Path) -> Path:
@@ -164,20 +129,21 @@ def save_summary_csv(frame: pd.DataFrame, output_path: Path) -> Path:
 
 def generate_permissions_reports(
     base_path: Path = DEFAULT_BASE_PATH,
+    fig: Figure | None = None,
 ) -> dict[str, Path]:
     summaries = collect_permission_summaries(base_path)
-    if not summaries:
+    if not summaries["manufacturer"]:
         return {}
 
     frame = summaries_to_frame(summaries)
-    permissions_dir = PERMISSIONS_DIR
-    outputs = {
+    permissions_dir = ensure_dir(PERMISSIONS_DIR)
+    # one figure (the caller's, or the process-wide shared one) is cleared and reused for all three charts
+    return {
         "summary_csv": save_summary_csv(frame, permissions_dir / "permissions_summary.csv"),
-        "stacked_bar": plot_stacked_bar(frame, permissions_dir / "permissions_stacked.png"),
-        "score_bar": plot_score_bars(frame, permissions_dir / "permissions_scores.png"),
-        "risk_pie": plot_risk_pie(frame, permissions_dir / "permissions_risk_split.png"),
+        "stacked_bar": plot_stacked_bar(frame, permissions_dir / "permissions_stacked.png", fig=fig),
+        "score_bar": plot_score_bars(frame, permissions_dir / "permissions_scores.png", fig=fig),
+        "risk_pie": plot_risk_pie(frame, permissions_dir / "permissions_risk_split.png", fig=fig),
     }
-    return outputs
 
 if __name__ == "__main__":
     results = generate_permissions_reports()
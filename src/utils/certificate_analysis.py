@@ -1,5 +1,6 @@
 from collections.abc import Mapping
 from pathlib import Path
+import csv
 import sys
 
 SRC_PATH = Path(__file__).resolve().parents[1]
@@ -8,11 +9,14 @@ if str(SRC_PATH) not in sys.path:
 
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
+from matplotlib.figure import Figure
 
-from apps import available_apps
+from apps import iter_app_csvs
 from utils import scoring
+from utils.charts import reset_figure, save_figure
+from utils.paths import ensure_dir
+from utils.loaders import score_certificate_csv
 
 PROJECT_ROOT = SRC_PATH.parent
 GENERATED_ROOT = SRC_PATH / "generated"
@@ -21,47 +25,20 @@ CERTIFICATES_DIR = GENERATED_ROOT / "certificates"
 CERTIFICATE_CSV = "certificate_analysis.csv"
 
 
-def handle_score_certificate_analysis(dataframe: pd.DataFrame) -> dict[str, int]:
-    if "SEVERITY" not in dataframe.columns and "severity" not in dataframe.columns:
-        return {"unknown": len(dataframe)}
-
-    if "SEVERITY" in dataframe.columns:
-        sev_col = dataframe["SEVERITY"]
-    else:
-        sev_col = dataframe["severity"]
-
-    sev_series = sev_col.fillna("unknown").astype(str).str.strip().str.lower()
-    counts = sev_series.value_counts().to_dict()
-
-    mapped_counts: dict[str, int] = {}
-    for sev, count in counts.items():
-        risk_level = scoring.map_to_risk(sev)
-        mapped_counts[risk_level] = mapped_counts.get(risk_level, 0) + count
-
-    return {str(k): int(v) for k, v in mapped_counts.items()}
-
-
 def load_certificate_counts(base_path: Path = PROJECT_ROOT) -> dict[str, dict[str, int]]:
-    counts: dict[str, dict[str, int]] = {}
-    for app in available_apps(base_path):
-        csv_path = base_path / app / CERTIFICATE_CSV
-        if not csv_path.exists():
-            continue
-        dataframe = pd.read_csv(csv_path)
-        counts[Path(app).name] = handle_score_certificate_analysis(dataframe)
-    return counts
+    return {app: score_certificate_csv(csv_path) for app, csv_path in iter_app_csvs(base_path, CERTIFICATE_CSV)}
 
 
 def save_certificate_bar_chart(
     counts: Mapping[str, Mapping[str, int]],
     output_path: Path,
+    fig: Figure | None = None,
 ) -> Path:
     if not counts:
         raise ValueError("No certificate counts provided")
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    if output_path.exists():
-        output_path.unlink()
+    ensure_dir(output_path.parent)
+    output_path.unlink(missing_ok=True)
 
     manufacturers = list(counts.keys())
     severity_set = set()
@@ -69,11 +46,15 @@ def save_certificate_bar_chart(
         severity_set.update(counts[m].keys())
     severities = sorted(severity_set)
 
-    values_by_sev = {sev: [counts[m].get(sev, 0) for m in manufacturers] for sev in severities}
+    vals_matrix = np.asarray(
+        [[counts[m].get(sev, 0) for m in manufacturers] for sev in severities], dtype=np.int64
+    ).reshape(len(severities), len(manufacturers))
+    # bottom of each severity layer is the running total of the layers below it
+    bottoms = np.vstack([np.zeros(len(manufacturers), dtype=np.int64), vals_matrix[:-1].cumsum(axis=0)])
 
     x_positions = list(range(len(manufacturers)))
 
-    fig, ax = plt.subplots(figsize=(max(6, len(manufacturers) * 0.9), 5))
+    chart_fig, ax = reset_figure(fig, (max(6, len(manufacturers) * 0.9), 5))
 
     color_map = {
         "high": "#d62728",
@@ -82,23 +63,19 @@ def save_certificate_bar_chart(
     }
     fallback_palette = ["#abf301", "#9467bd", "#8c564b"]
 
-    bottom = [0] * len(manufacturers)
     for idx, sev in enumerate(severities):
-        vals = values_by_sev[sev]
         color = color_map.get(sev, fallback_palette[idx % len(fallback_palette)])
-        ax.bar(x_positions, vals, bottom=bottom, color=color, label=sev)
-        bottom = [b + v for b, v in zip(bottom, vals)]
+        ax.bar(x_positions, vals_matrix[idx], bottom=bottoms[idx], color=color, label=sev, rasterized=True)
 
     ax.set_ylabel("Findings count")
     ax.set_title("Certificate security findings per manufacturer (by severity)")
     ax.set_xticks(x_positions, manufacturers, rotation=45, ha="right")
-    max_value = max(bottom) if bottom else 0
+    max_value = int(vals_matrix.sum(axis=0).max()) if manufacturers else 0
     ax.set_ylim(0, max_value + 1)
     ax.grid(axis="y", linestyle="--", alpha=0.4)
     ax.legend(title="Severity", bbox_to_anchor=(1.02, 1), loc="upper left")
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
 
@@ -106,45 +83,30 @@ def save_certificate_summary_csv(counts: Mapping[str, Mapping[str, int]], output
     if not counts:
         raise ValueError("No certificate counts provided")
 
-    rows = []
-    for m, sevmap in counts.items():
-        high = int(sevmap.get("high", 0))
-        medium = int(sevmap.get("medium", 0))
-        normal = int(sevmap.get("normal", 0))
-        total = high + medium + normal
-        score = int(scoring.weighted_score({"high": high, "medium": medium, "normal": normal}))
-        rows.append(
-            {
-                "manufacturer": m,
-                "high": high,
-                "medium": medium,
-                "normal": normal,
-                "total": total,
-                "score": score,
-            }
-        )
-
-    df = pd.DataFrame(rows)
-    df = df[["manufacturer", "high", "medium", "normal", "total", "score"]]
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    ensure_dir(output_path.parent)
+    with output_path.open("w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["manufacturer", "high", "medium", "normal", "total", "score"])
+        for m, sevmap in counts.items():
+            high = int(sevmap.get("high", 0))
+            medium = int(sevmap.get("medium", 0))
+            normal = int(sevmap.get("normal", 0))
+            score = scoring.weighted_score({"high": high, "medium": medium, "normal": normal})
+            writer.writerow([m, high, medium, normal, high + medium + normal, score])
     return output_path
 
 
-def generate_certificate_report(base_path: Path = PROJECT_ROOT) -> Path | None:
+def generate_certificate_report(base_path: Path = PROJECT_ROOT, fig: Figure | None = None) -> Path | None:
     counts = load_certificate_counts(base_path)
     if not counts:
         return None
     output_path = CERTIFICATES_DIR / "certificate_security_counts.png"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    if output_path.exists():
-        output_path.unlink()
+    ensure_dir(CERTIFICATES_DIR)
 
-    chart_path = save_certificate_bar_chart(counts, output_path)
+    chart_path = save_certificate_bar_chart(counts, output_path, fig=fig)
 
     csv_path = CERTIFICATES_DIR / "certificate_security_summary.csv"
-    if csv_path.exists():
-        csv_path.unlink()
+    csv_path.unlink(missing_ok=True)
     save_certificate_summary_csv(counts, csv_path)
 
     return chart_path
@@ -0,0 +1,34 @@
+# Figure helpers shared by the chart writers so one Figure can be reused
+# across several charts.
+######################################
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+_SHARED_FIG: Figure | None = None
+
+
+def reset_figure(fig: Figure | None, figsize: tuple[float, float]) -> tuple[Figure, Axes]:
+    if fig is None:
+        fig = shared_figure()
+    fig.clear()
+    fig.set_size_inches(figsize)
+    return fig, fig.add_subplot(111)
+
+
+def shared_figure() -> Figure:
+    # built once per process outside pyplot, so it is never closed or tracked
+    global _SHARED_FIG
+    if _SHARED_FIG is None:
+        _SHARED_FIG = Figure()
+        FigureCanvasAgg(_SHARED_FIG)
+    return _SHARED_FIG
+
+
+def save_figure(fig: Figure, output_path, dpi: int = 150) -> None:
+    # reuse an existing Agg canvas so caller-supplied pyplot figures stay attached
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    canvas.print_figure(output_path, dpi=dpi, pil_kwargs={"optimize": True})
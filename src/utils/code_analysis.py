@@ -6,10 +6,13 @@ from pathlib import Path
 import sys
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import pandas as pd
 from apps import available_apps
 from utils import scoring
+from utils.charts import reset_figure, save_figure
+from utils.csv_cache import read_csv_cached
+from utils.loaders import SEVERITY_COLUMNS
 
 SRC_PATH = Path(__file__).resolve().parents[1]
 if str(SRC_PATH) not in sys.path:
@@ -22,11 +25,10 @@ CODE_CSV = "code_analysis.csv"
 
 
 def handle_score_code_analysis(dataframe: pd.DataFrame) -> dict[str, int]:
-    if "SEVERITY" not in dataframe.columns and "severity" not in dataframe.columns:
+    col = next((c for c in SEVERITY_COLUMNS if c in dataframe.columns), None)
+    if col is None:
         return {"unknown": len(dataframe)}
-
-    if "SEVERITY" in dataframe.columns:
-        sev_col = dataframe["SEVERITY"]
+    sev_col = dataframe[col]
 
     # normalize severity values
     sev_series = sev_col.fillna("unknown").astype(str).str.strip().str.lower()
@@ -48,7 +50,7 @@ def load_code_counts(base_path: Path = PROJECT_ROOT) -> dict[str, dict[str, int]
         csv_path = base_path / app / CODE_CSV
         if not csv_path.exists():
             continue
-        dataframe = pd.read_csv(csv_path)
+        dataframe = read_csv_cached(csv_path, columns=SEVERITY_COLUMNS)
         counts[Path(app).name] = handle_score_code_analysis(dataframe)
     return counts
 
@@ -56,6 +58,7 @@ def load_code_counts(base_path: Path = PROJECT_ROOT) -> dict[str, dict[str, int]
 def save_code_bar_chart(
     counts: Mapping[str, Mapping[str, int]],
     output_path: Path,
+    fig: Figure | None = None,
 ) -> Path:
     if not counts:
         raise ValueError("No code counts provided")
@@ -74,7 +77,7 @@ def save_code_bar_chart(
     # build stacked values per severity
     values_by_sev = {sev: [counts[m].get(sev, 0) for m in manufacturers] for sev in severities}
     x_positions = list(range(len(manufacturers)))
-    fig, ax = plt.subplots(figsize=(max(6, len(manufacturers) * 0.9), 5))
+    chart_fig, ax = reset_figure(fig, (max(6, len(manufacturers) * 0.9), 5))
 
     # choose a color palette (extendable)
     palette = ["#d62728", "#ff7f0e", "#2b77ae", "#abf301", "#9467bd", "#8c564b"]
@@ -94,9 +97,8 @@ def save_code_bar_chart(
     ax.set_ylim(0, max_value + 1)
     ax.grid(axis="y", linestyle="--", alpha=0.4)
     ax.legend(title="Severity", bbox_to_anchor=(1.02, 1), loc="upper left")
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path, dpi=300)
     return output_path
 
 
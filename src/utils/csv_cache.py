@@ -0,0 +1,75 @@
+# Parquet cache for the MobSF CSV exports. Every CSV is parsed once (all
+# columns as strings) and later reads only load the requested columns. Loaded
+# tables are also kept in memory for the life of the process.
+######################################
+
+from collections.abc import Sequence
+from functools import lru_cache
+from hashlib import sha1
+from pathlib import Path
+import os
+import sys
+
+SRC_PATH = Path(__file__).resolve().parents[1]
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+GENERATED_ROOT = SRC_PATH / "generated"
+CACHE_DIR = GENERATED_ROOT / ".cache"
+
+
+def _source_key(csv_path: Path) -> str:
+    return sha1(str(csv_path.resolve()).encode()).hexdigest()
+
+
+def cache_path_for(csv_path: Path) -> Path:
+    stat = csv_path.stat()
+    return CACHE_DIR / f"{_source_key(csv_path)}-{stat.st_mtime_ns}-{stat.st_size}.parquet"
+
+
+def ensure_cached(csv_path: Path) -> Path:
+    cache_path = cache_path_for(csv_path)
+    if cache_path.exists():
+        return cache_path
+
+    reader = pacsv.open_csv(csv_path)
+    header = reader.schema.names
+    reader.close()
+    table = pacsv.read_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=True,
+        ),
+    )
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # write then rename so concurrent readers never see a partial file
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, cache_path)
+    # drop the entries written for earlier versions of the same CSV
+    for stale_path in CACHE_DIR.glob(f"{_source_key(csv_path)}-*.parquet"):
+        if stale_path != cache_path:
+            stale_path.unlink(missing_ok=True)
+    return cache_path
+
+
+@lru_cache(maxsize=256)
+def _read_table(cache_path: Path, columns: tuple[str, ...] | None) -> pa.Table:
+    # cache_path already encodes the CSV's mtime and size, so edits miss the cache
+    if columns is not None:
+        # unknown names are skipped; with no match the frame keeps its row count
+        present = pq.read_schema(cache_path).names
+        columns = [name for name in present if name in columns]
+    return pq.read_table(cache_path, columns=columns)
+
+
+def read_csv_cached(csv_path: Path, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    cache_path = ensure_cached(csv_path)
+    table = _read_table(cache_path, None if columns is None else tuple(columns))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
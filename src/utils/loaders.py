@@ -0,0 +1,92 @@
+# Pure pandas helpers shared by the analyzers. This module must not import
+# matplotlib so that it stays cheap to load.
+######################################
+
+from pathlib import Path
+import sys
+
+SRC_PATH = Path(__file__).resolve().parents[1]
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+import pandas as pd
+
+from utils import scoring
+from utils.csv_cache import read_csv_cached
+
+COLUMN_CANDIDATES: tuple[str, ...] = (
+    "STATUS",
+    "status",
+    "Status",
+    "SEVERITY",
+    "severity",
+    "Severity",
+)
+SEVERITY_COLUMNS: tuple[str, ...] = ("SEVERITY", "severity")
+KNOWN_SEVERITIES: tuple[str, ...] = ("high", "medium", "low", "warning", "info", "secure", "unknown", "normal")
+_SEV_TO_RISK: dict[str, str] = {sev: scoring.map_to_risk(sev) for sev in KNOWN_SEVERITIES}
+
+
+def find_status_column(frame: pd.DataFrame) -> str | None:
+    for candidate in COLUMN_CANDIDATES:
+        if candidate in frame.columns:
+            return candidate
+    return None
+
+
+def summarize_manufacturer(csv_path: Path) -> dict[str, int | str] | None:
+    dataframe = read_csv_cached(csv_path, columns=COLUMN_CANDIDATES)
+    column = find_status_column(dataframe)
+    if column is None:
+        return None
+    summary = scoring.summarize_risks(dataframe[column])
+    manufacturer = csv_path.parent.name
+    return {
+        "manufacturer": manufacturer,
+        "high": int(summary.get("high", 0)),
+        "medium": int(summary.get("medium", 0)),
+        "normal": int(summary.get("normal", 0)),
+        "total_permissions": int(summary.get("total", 0)),
+        "score": int(summary.get("score", 0)),
+    }
+
+
+def count_severity_risks(sev_col: pd.Series) -> dict[str, int]:
+    sev_series = sev_col.fillna("unknown").astype("string").str.strip().str.lower()
+    risk = sev_series.map(_SEV_TO_RISK)
+    # only severities outside the known vocabulary go through map_to_risk
+    unmapped = risk.isna()
+    if unmapped.any():
+        risk[unmapped] = sev_series[unmapped].map(scoring.map_to_risk)
+    counts = risk.groupby(risk, sort=False).size()
+    return {str(k): int(v) for k, v in counts.items()}
+
+
+def handle_score_certificate_analysis(dataframe: pd.DataFrame) -> dict[str, int]:
+    if "SEVERITY" not in dataframe.columns and "severity" not in dataframe.columns:
+        return {"unknown": len(dataframe)}
+
+    if "SEVERITY" in dataframe.columns:
+        sev_col = dataframe["SEVERITY"]
+    else:
+        sev_col = dataframe["severity"]
+
+    return count_severity_risks(sev_col)
+
+
+def score_certificate_csv(csv_path: Path) -> dict[str, int]:
+    return handle_score_certificate_analysis(read_csv_cached(csv_path, columns=SEVERITY_COLUMNS))
+
+
+# receives the csv dataframe and normalizes the values to map it to the defined score
+def handle_score_manifest_analysis(dataframe: pd.DataFrame) -> dict[str, int]:
+    col = next((c for c in SEVERITY_COLUMNS if c in dataframe.columns), None)
+    if col is None:
+        return {"unknown": len(dataframe)}
+    sev_col = dataframe[col]
+
+    return count_severity_risks(sev_col)
+
+
+def score_manifest_csv(csv_path: Path) -> dict[str, int]:
+    return handle_score_manifest_analysis(read_csv_cached(csv_path, columns=SEVERITY_COLUMNS))
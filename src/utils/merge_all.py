@@ -1,4 +1,5 @@
 
+from collections.abc import Iterator
 from pathlib import Path
 import sys
 from typing import Optional
@@ -8,16 +9,21 @@ if str(SRC_PATH) not in sys.path:
 	sys.path.append(str(SRC_PATH))
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
-from apps import available_apps
+from apps import available_apps, scan_apps
+from utils.csv_cache import ensure_cached
 
 PROJECT_ROOT = SRC_PATH.parent
 GENERATED_ROOT = SRC_PATH / "generated"
 MERGED_DIR = GENERATED_ROOT / "merged"
 
 
-def load_all_csvs(target_filename: str | None, base_path: Path = PROJECT_ROOT) -> pd.DataFrame:
-	frames = []
+def find_source_csvs(target_filename: str | None, base_path: Path = PROJECT_ROOT) -> list[tuple[str, Path]]:
+	sources = []
 	for app in available_apps(base_path):
 		app_path = base_path / app
 		if target_filename:
@@ -28,32 +34,58 @@ def load_all_csvs(target_filename: str | None, base_path: Path = PROJECT_ROOT) -
 		for csv_path in candidates:
 			if not csv_path or not Path(csv_path).exists():
 				continue
-			try:
-				df = pd.read_csv(csv_path)
-			except Exception:
-				# skip unreadable files
-				continue
-			df = df.copy()
-			df["app"] = Path(app).name
-			df["source_path"] = str(csv_path)
-			frames.append(df)
+			sources.append((Path(app).name, Path(csv_path)))
+	return sources
+
+
+def open_sources_dataset(sources: list[tuple[str, Path]]) -> tuple[ds.Dataset, dict[str, tuple[str, Path]]] | None:
+	# map each cached parquet file back to the app and CSV it came from
+	origins: dict[str, tuple[str, Path]] = {}
+	for app, csv_path in sources:
+		try:
+			cache_path = ensure_cached(csv_path)
+		except Exception:
+			# skip unreadable files
+			continue
+		origins[str(cache_path)] = (app, csv_path)
+
+	if not origins:
+		return None
+
+	# union of columns; files missing a column read it as nulls
+	schema = pa.unify_schemas([pq.read_schema(path) for path in origins])
+	dataset = ds.dataset(list(origins), schema=schema, format="parquet")
+	return dataset, origins
+
+
+def iter_tagged_batches(dataset: ds.Dataset, origins: dict[str, tuple[str, Path]]) -> Iterator[pa.RecordBatch]:
+	for tagged in dataset.scanner().scan_batches():
+		app, csv_path = origins[tagged.fragment.path]
+		batch = tagged.record_batch
+		rows = batch.num_rows
+		yield pa.RecordBatch.from_arrays(
+			batch.columns + [pa.repeat(pa.scalar(app, pa.string()), rows), pa.repeat(pa.scalar(str(csv_path), pa.string()), rows)],
+			schema=tagged_schema(dataset.schema),
+		)
 
-	if not frames:
+
+def tagged_schema(schema: pa.Schema) -> pa.Schema:
+	return schema.append(pa.field("app", pa.string())).append(pa.field("source_path", pa.string()))
+
+
+def load_all_csvs(target_filename: str | None, base_path: Path = PROJECT_ROOT) -> pd.DataFrame:
+	opened = open_sources_dataset(find_source_csvs(target_filename, base_path))
+	if opened is None:
 		return pd.DataFrame()
 
-	# Concatenate using union of columns
-	result = pd.concat(frames, ignore_index=True, sort=False)
-	return result
+	dataset, origins = opened
+	table = pa.Table.from_batches(iter_tagged_batches(dataset, origins), schema=tagged_schema(dataset.schema))
+	return table.to_pandas(types_mapper=pd.ArrowDtype)
 
 
-def find_all_csv_filenames(base_path: Path = PROJECT_ROOT) -> set[str]:
-	names = set()
-	for app in available_apps(base_path):
-		app_path = base_path / app
-		for p in app_path.glob("*.csv"):
-			if p.is_file():
-				names.add(p.name)
-	return names
+def find_all_csv_filenames(base_path: Path = PROJECT_ROOT) -> frozenset[str]:
+	# scan_apps is already cached per base path and keyed on its mtime
+	return frozenset(name for _, files in scan_apps(base_path) for name in files if name.endswith(".csv"))
 
 
 def load_all_grouped_by_filename(base_path: Path = PROJECT_ROOT) -> dict[str, pd.DataFrame]:
@@ -74,10 +106,26 @@ def save_merged(df: pd.DataFrame, output_path: Path) -> Path:
 	return output_path
 
 
-def generate_summary_for(target_filename: str | None, base_path: Path = PROJECT_ROOT, output_name: str | None = None, outdir: Path | None = None) -> Optional[Path]:
-	df = load_all_csvs(target_filename, base_path)
-	if df.empty:
+def stream_merge(sources: list[tuple[str, Path]], output_path: Path) -> Optional[Path]:
+	# write batch by batch so only one batch is held in memory at a time
+	opened = open_sources_dataset(sources)
+	if opened is None:
+		return None
+	dataset, origins = opened
+	if dataset.count_rows() == 0:
 		return None
+
+	output_path.parent.mkdir(parents=True, exist_ok=True)
+	if output_path.exists():
+		output_path.unlink()
+	write_options = pacsv.WriteOptions(quoting_style="needed")
+	with pacsv.CSVWriter(str(output_path), tagged_schema(dataset.schema), write_options=write_options) as writer:
+		for batch in iter_tagged_batches(dataset, origins):
+			writer.write_batch(batch)
+	return output_path
+
+
+def generate_summary_for(target_filename: str | None, base_path: Path = PROJECT_ROOT, output_name: str | None = None, outdir: Path | None = None) -> Optional[Path]:
 	if output_name:
 		out_name = output_name
 	else:
@@ -89,19 +137,18 @@ def generate_summary_for(target_filename: str | None, base_path: Path = PROJECT_
 		output_path = outdir / out_name
 	else:
 		output_path = MERGED_DIR / out_name
-	return save_merged(df, output_path)
+	return stream_merge(find_source_csvs(target_filename, base_path), output_path)
 
 
 def generate_summaries_for_all(base_path: Path = PROJECT_ROOT, outdir: Path | None = None) -> list[Path]:
-	grouped = load_all_grouped_by_filename(base_path)
 	saved: list[Path] = []
-	for name, df in grouped.items():
+	for name in sorted(find_all_csv_filenames(base_path)):
 		if outdir:
 			out_path = outdir / f"summary_{name}"
 		else:
 			out_path = MERGED_DIR / f"summary_{name}"
-		save_merged(df, out_path)
-		saved.append(out_path)
+		if stream_merge(find_source_csvs(name, base_path), out_path):
+			saved.append(out_path)
 	return saved
 
 
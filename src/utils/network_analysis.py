@@ -1,5 +1,6 @@
 from collections.abc import Mapping
 from pathlib import Path
+import logging
 import sys
 
 SRC_PATH = Path(__file__).resolve().parents[1]
@@ -8,11 +9,15 @@ if str(SRC_PATH) not in sys.path:
 
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
 
-from apps import available_apps
+from apps import iter_app_csvs
 from utils import scoring
+from utils.charts import reset_figure, save_figure
+from utils.csv_cache import read_csv_cached
+from utils.loaders import SEVERITY_COLUMNS
 
 PROJECT_ROOT = SRC_PATH.parent
 GENERATED_ROOT = SRC_PATH / "generated"
@@ -20,6 +25,8 @@ NETWORK_DIR = GENERATED_ROOT / "network"
 
 NETWORK_CSV = "network_security.csv"
 
+LOG = logging.getLogger(__name__)
+
 
 def handle_score_network_security(dataframe: pd.DataFrame) -> dict[str, int]:
     if "SEVERITY" not in dataframe.columns and "severity" not in dataframe.columns:
@@ -31,34 +38,30 @@ def handle_score_network_security(dataframe: pd.DataFrame) -> dict[str, int]:
     else:
         sev_col = dataframe["severity"]
 
-    # normalize severity values
-    sev_series = sev_col.fillna("unknown").astype(str).str.strip().str.lower()
-    counts = sev_series.value_counts().to_dict()
-
-    # Map severity to the scoring module's risk levels
+    # normalize and map only the distinct severities, then count the integer codes;
+    # missing values (code -1) are shifted into slot 0 and counted as "unknown"
+    cat = pd.Categorical(sev_col)
+    risks = [scoring.map_to_risk("unknown")] + [scoring.map_to_risk(sev) for sev in cat.categories]
     mapped_counts: dict[str, int] = {}
-    for sev, count in counts.items():
-        risk_level = scoring.map_to_risk(sev)
-        mapped_counts[risk_level] = mapped_counts.get(risk_level, 0) + count
+    for risk_level, count in zip(risks, np.bincount(cat.codes + 1, minlength=len(risks))):
+        if count:
+            mapped_counts[risk_level] = mapped_counts.get(risk_level, 0) + int(count)
 
-    # ensure keys are str
-    return {str(k): int(v) for k, v in mapped_counts.items()}
+    return mapped_counts
 
 
 def load_network_counts(base_path: Path = PROJECT_ROOT) -> dict[str, dict[str, int]]:
     counts: dict[str, dict[str, int]] = {}
-    for app in available_apps(base_path):
-        csv_path = base_path / app / NETWORK_CSV
-        if not csv_path.exists():
-            continue
-        dataframe = pd.read_csv(csv_path)
-        counts[Path(app).name] = handle_score_network_security(dataframe)
+    for app, csv_path in iter_app_csvs(base_path, NETWORK_CSV):
+        dataframe = read_csv_cached(csv_path, columns=SEVERITY_COLUMNS)
+        counts[app] = handle_score_network_security(dataframe)
     return counts
 
 
 def save_network_bar_chart(
     counts: Mapping[str, Mapping[str, int]],
     output_path: Path,
+    fig: Figure | None = None,
 ) -> Path:
     if not counts:
         raise ValueError("No network counts provided")
@@ -75,33 +78,33 @@ def save_network_bar_chart(
     severities = sorted(severity_set)
 
     # build stacked values per severity
-    values_by_sev = {sev: [counts[m].get(sev, 0) for m in manufacturers] for sev in severities}
+    vals_matrix = np.asarray(
+        [[counts[m].get(sev, 0) for m in manufacturers] for sev in severities], dtype=np.int64
+    ).reshape(len(severities), len(manufacturers))
+    # bottom of each severity layer is the running total of the layers below it
+    bottoms = np.vstack([np.zeros(len(manufacturers), dtype=np.int64), vals_matrix[:-1].cumsum(axis=0)])
 
     x_positions = list(range(len(manufacturers)))
 
-    fig, ax = plt.subplots(figsize=(max(6, len(manufacturers) * 0.9), 5))
+    chart_fig, ax = reset_figure(fig, (max(6, len(manufacturers) * 0.9), 5))
 
     # choose a color palette (extendable)
     palette = ["#d62728", "#ff7f0e", "#2b77ae", "#abf301", "#9467bd", "#8c564b"]
     # map severities to colors deterministically
     colors = {sev: palette[i % len(palette)] for i, sev in enumerate(severities)}
 
-    bottom = [0] * len(manufacturers)
-    for sev in severities:
-        vals = values_by_sev[sev]
-        ax.bar(x_positions, vals, bottom=bottom, color=colors.get(sev), label=sev)
-        bottom = [b + v for b, v in zip(bottom, vals)]
+    for idx, sev in enumerate(severities):
+        ax.bar(x_positions, vals_matrix[idx], bottom=bottoms[idx], color=colors.get(sev), label=sev)
 
     ax.set_ylabel("Findings count")
     ax.set_title("Network security findings per manufacturer (by severity)")
     ax.set_xticks(x_positions, manufacturers, rotation=45, ha="right")
-    max_value = max(bottom) if bottom else 0
+    max_value = int(vals_matrix.sum(axis=0).max()) if manufacturers else 0
     ax.set_ylim(0, max_value + 1)
     ax.grid(axis="y", linestyle="--", alpha=0.4)
     ax.legend(title="Severity", bbox_to_anchor=(1.02, 1), loc="upper left")
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
 
@@ -157,15 +160,16 @@ def generate_network_report(base_path: Path = PROJECT_ROOT) -> Path | None:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     path = generate_network_report()
     if path:
-        print(f"Saved network chart to {path}")
-        print(f"Saved summary CSV to {NETWORK_DIR / 'network_security_summary.csv'}")
+        LOG.info("Saved network chart to %s", path)
+        LOG.info("Saved summary CSV to %s", NETWORK_DIR / "network_security_summary.csv")
         # also print a brief severity table for CLI users
         counts = load_network_counts()
         for m, sevmap in counts.items():
-            print(f"{m}:")
+            LOG.info("%s:", m)
             for sev, c in sorted(sevmap.items(), key=lambda x: (-x[1], x[0])):
-                print(f"  {sev}: {c}")
+                LOG.info("  %s: %s", sev, c)
     else:
-        print("No network security data available to plot")
+        LOG.info("No network security data available to plot")
@@ -0,0 +1,14 @@
+# Output directory helpers shared by the report writers.
+######################################
+
+from pathlib import Path
+
+_CREATED_DIRS: set[Path] = set()
+
+
+def ensure_dir(path: Path) -> Path:
+    # each directory is created at most once per process
+    if path not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(path)
+    return path
@@ -3,11 +3,14 @@ Privacy scoring module that scrapes Mozilla Privacy Not Included pages
 for car manufacturer apps and generates privacy reports.
 """
 from collections.abc import Mapping
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from hashlib import sha1
 from pathlib import Path
 import sys
 import re
 import json
+import logging
+import time
 
 SRC_PATH = Path(__file__).resolve().parents[1]
 if str(SRC_PATH) not in sys.path:
@@ -15,16 +18,40 @@ if str(SRC_PATH) not in sys.path:
 
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
+import orjson
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from apps import available_apps
+from utils.charts import reset_figure, save_figure
 
 PROJECT_ROOT = SRC_PATH.parent
 GENERATED_ROOT = SRC_PATH / "generated"
 PNI_DIR = GENERATED_ROOT / "pni"
+PNI_FETCH_WORKERS = 16
+PNI_CACHE_DIR = GENERATED_ROOT / "pni_cache"
+PNI_CACHE_TTL = 24 * 60 * 60  # seconds
+
+LOG = logging.getLogger(__name__)
+
+# One pooled session for every fetch: the PNI pages all live on one host, so
+# connections (and their TLS handshakes) are reused across manufacturers.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=PNI_FETCH_WORKERS,
+    pool_maxsize=PNI_FETCH_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (compatible; PrivacyScorer/1.0)',
+    'Accept-Encoding': 'gzip, deflate',
+})
 
 # Map manufacturer folder names to Mozilla PNI URL slugs
 MANUFACTURER_PNI_URLS: dict[str, str] = {
@@ -44,23 +71,118 @@ MANUFACTURER_PNI_URLS: dict[str, str] = {
     "Toyota": "https://foundation.mozilla.org/en/privacynotincluded/toyota/",
 }
 
+PNI_MANUFACTURERS: frozenset[str] = frozenset(MANUFACTURER_PNI_URLS)
 
-def fetch_pni_page(url: str) -> str | None:
-    """Fetch HTML content from a Mozilla PNI URL."""
+_PRODUCT_RE = re.compile(r'/privacynotincluded/([^/]+)/?$')
+_DEVICE_RE = re.compile(r'device[:\s]*(yes|no|n/a)')
+_APP_RE = re.compile(r'app[:\s]*(yes|no|n/a)')
+_BIOMETRIC_RE = re.compile(r'biometric|fingerprint|faceprint|voiceprint|facial recognition')
+_TARGETED_AD_RE = re.compile(r'targeted advertising|behavioral advertising|cross-context behavioral')
+_OPT_OUT_RE = re.compile(r'opt[- ]?out')
+_BREACH_RE = re.compile(r'breach|attack|hack|ransomware')
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Precompiled queries for the fixed page structure
+_XP_COMPANY = etree.XPath("//a[@id='product-company-url']")
+_XP_IT_USES = etree.XPath(f"//div[{_has_class('it-uses')}]")
+_XP_EXPLANATION = etree.XPath(f".//div[{_has_class('explanation')}]")
+_XP_DING_SECTIONS = etree.XPath(f"//section[{_has_class('show-ding')}]")
+_XP_SECTION_PARENT = etree.XPath("ancestor::section[1]")
+_XP_PRIMARY_INFO_PARENT = etree.XPath(f"ancestor::div[{_has_class('primary-info')}][1]")
+_XP_RATING = etree.XPath(f".//p[{_has_class('rating')}]")
+_XP_DING_BAND = etree.XPath(f"boolean(//div[{_has_class('privacy-ding-band')}])")
+# script/style/template bodies and comments are not page text
+_XP_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+def _node_text(node, strip: bool = False) -> str:
+    strings = _XP_TEXT(node)
+    if strip:
+        return "".join(s.strip() for s in strings)
+    return "".join(strings)
+
+
+def _cache_path(url: str) -> Path:
+    return PNI_CACHE_DIR / f"{sha1(url.encode()).hexdigest()}.html"
+
+
+def _validators_path(url: str) -> Path:
+    return _cache_path(url).with_suffix(".json")
+
+
+def _cached_get(url: str) -> str | None:
+    """Return the cached HTML for url if it is younger than PNI_CACHE_TTL."""
+    cache_path = _cache_path(url)
     try:
-        resp = requests.get(url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; PrivacyScorer/1.0)'
-        })
+        if cache_path.stat().st_mtime > time.time() - PNI_CACHE_TTL:
+            return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    return None
+
+
+def _load_validators(url: str) -> dict:
+    """Return the ETag/Last-Modified recorded for url, if its body is still on disk."""
+    try:
+        validators = json.loads(_validators_path(url).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not Path(validators.get("body_path", "")).is_file():
+        return {}
+    return validators
+
+
+def _store_page(url: str, resp: requests.Response) -> None:
+    PNI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path = _cache_path(url)
+    cache_path.write_text(resp.text, encoding="utf-8")
+    validators = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "body_path": str(cache_path),
+    }
+    _validators_path(url).write_text(json.dumps(validators), encoding="utf-8")
+
+
+def fetch_pni_page(url: str, session: requests.Session | None = None, use_cache: bool = True) -> str | None:
+    """Fetch HTML content from a Mozilla PNI URL, reusing the on-disk copy when fresh."""
+    headers = {}
+    validators = {}
+    if use_cache:
+        html = _cached_get(url)
+        if html is not None:
+            return html
+        # stale copy: ask the server whether it changed
+        validators = _load_validators(url)
+        if validators.get("etag"):
+            headers['If-None-Match'] = validators["etag"]
+        if validators.get("last_modified"):
+            headers['If-Modified-Since'] = validators["last_modified"]
+    try:
+        resp = (session or _SESSION).get(url, timeout=30, headers=headers)
         resp.raise_for_status()
-        return resp.text
     except Exception as e:
-        print(f"  Warning: Failed to fetch {url}: {e}")
+        LOG.warning("  Warning: Failed to fetch %s: %s", url, e)
         return None
+    if resp.status_code == 304 and validators:
+        body_path = Path(validators["body_path"])
+        body_path.touch()  # restart the TTL
+        return body_path.read_text(encoding="utf-8")
+    _store_page(url, resp)
+    return resp.text
 
 
 def extract_privacy_data(html: str, source_url: str = "") -> dict:
     """Extract privacy data from PNI HTML page."""
-    soup = BeautifulSoup(html, 'html.parser')
+    try:
+        tree = lxml.html.fromstring(html)
+    except etree.ParserError:
+        # blank page (whitespace or comments only): extract from an empty document
+        tree = lxml.html.fromstring("<html></html>")
     data = {
         "url": source_url,
         "product_name": "",
@@ -87,28 +209,36 @@ def extract_privacy_data(html: str, source_url: str = "") -> dict:
 
     # Extract product name from URL
     if source_url and 'privacynotincluded' in source_url:
-        match = re.search(r'/privacynotincluded/([^/]+)/?$', source_url)
+        match = _PRODUCT_RE.search(source_url)
         if match:
             data["product_name"] = match.group(1).replace('-', ' ').title()
 
+    # _node_text runs the XPath text query over the whole subtree, so each node's text is computed once
+    texts: dict[object, str] = {}
+
+    def lower_text(node) -> str:
+        if node not in texts:
+            texts[node] = _node_text(node).lower()
+        return texts[node]
+
     # Company from specific element
-    company_link = soup.find('a', id='product-company-url')
-    if company_link:
-        data["company"] = company_link.get_text(strip=True)
+    company_links = _XP_COMPANY(tree)
+    if company_links:
+        data["company"] = _node_text(company_links[0], strip=True)
 
-    text_lower = soup.get_text().lower()
+    text_lower = _node_text(tree).lower()
 
     # Snooping capabilities from "it-uses" divs
-    for div in soup.find_all('div', class_='it-uses'):
-        h4 = div.find('h4')
-        if not h4:
+    for div in _XP_IT_USES(tree):
+        h4 = div.find('.//h4')
+        if h4 is None:
             continue
-        label = h4.get_text(strip=True).lower()
-        explanation = div.find('div', class_='explanation')
-        if explanation:
-            text = explanation.get_text().lower()
-            device_match = re.search(r'device[:\s]*(yes|no|n/a)', text)
-            app_match = re.search(r'app[:\s]*(yes|no|n/a)', text)
+        label = _node_text(h4, strip=True).lower()
+        explanations = _XP_EXPLANATION(div)
+        if explanations:
+            text = lower_text(explanations[0])
+            device_match = _DEVICE_RE.search(text)
+            app_match = _APP_RE.search(text)
             device_val = device_match.group(1) == 'yes' if device_match else None
             app_val = app_match.group(1) == 'yes' if app_match else None
 
@@ -123,15 +253,14 @@ def extract_privacy_data(html: str, source_url: str = "") -> dict:
                 data["tracks_location_app"] = app_val
 
     # Biometrics
-    biometric_terms = ['biometric', 'fingerprint', 'faceprint', 'voiceprint', 'facial recognition']
-    data["collects_biometrics"] = any(term in text_lower for term in biometric_terms)
+    data["collects_biometrics"] = bool(_BIOMETRIC_RE.search(text_lower))
 
     # Data usage - check ding sections
-    for section in soup.find_all('section', class_='show-ding'):
-        section_text = section.get_text().lower()
-        h3 = section.find('h3')
-        h3_text = h3.get_text().lower() if h3 else ""
+    for section in _XP_DING_SECTIONS(tree):
+        h3 = section.find('.//h3')
+        h3_text = lower_text(h3) if h3 is not None else ""
         if 'how does the company use' in h3_text:
+            section_text = lower_text(section)
             if 'sell' in section_text:
                 data["sells_data"] = True
             if 'marketing' in section_text:
@@ -143,23 +272,23 @@ def extract_privacy_data(html: str, source_url: str = "") -> dict:
     if 'shares personal data' in text_lower:
         data["shares_for_marketing"] = True
 
-    data["targeted_advertising"] = any(term in text_lower for term in
-        ['targeted advertising', 'behavioral advertising', 'cross-context behavioral'])
+    data["targeted_advertising"] = bool(_TARGETED_AD_RE.search(text_lower))
 
     # User control
     if 'right to' in text_lower and ('delete' in text_lower or 'erasure' in text_lower):
         data["data_deletion_available"] = "some_regions"
-    data["opt_out_available"] = bool(re.search(r'opt[- ]?out', text_lower)) or 'do not sell' in text_lower
+    data["opt_out_available"] = bool(_OPT_OUT_RE.search(text_lower)) or 'do not sell' in text_lower
 
     # Ratings from h3 + rating pattern
-    for h3 in soup.find_all('h3'):
-        h3_text = h3.get_text().lower()
-        parent = h3.find_parent('section') or h3.find_parent('div', class_='primary-info')
-        if not parent:
+    for h3 in tree.iter('h3'):
+        h3_text = lower_text(h3)
+        parents = _XP_SECTION_PARENT(h3) or _XP_PRIMARY_INFO_PARENT(h3)
+        if not parents:
             continue
-        rating = parent.find('p', class_='rating')
-        if rating:
-            rating_text = rating.get_text(strip=True).lower()
+        parent = parents[0]
+        ratings = _XP_RATING(parent)
+        if ratings:
+            rating_text = _node_text(ratings[0], strip=True).lower()
             if 'user-friendly privacy' in h3_text:
                 data["user_friendly_privacy_info"] = rating_text == 'yes'
             elif 'track record' in h3_text:
@@ -167,13 +296,13 @@ def extract_privacy_data(html: str, source_url: str = "") -> dict:
                     data["security_status"] = 'good'
                 elif rating_text in ['average', 'needs improvement', 'bad']:
                     data["security_status"] = 'warning'
-                section_text = parent.get_text().lower()
-                if any(term in section_text for term in ['breach', 'attack', 'hack', 'ransomware']):
+                section_text = lower_text(parent)
+                if _BREACH_RE.search(section_text):
                     data["known_breaches"] = True
                     data["breach_severity"] = "significant" if 'significant' in section_text else "minor"
 
     # Privacy warning
-    if soup.find('div', class_='privacy-ding-band') or '*privacy not included' in text_lower:
+    if _XP_DING_BAND(tree) or '*privacy not included' in text_lower:
         data["privacy_warning"] = True
 
     return data
@@ -278,19 +407,31 @@ def calculate_privacy_score(data: dict) -> dict:
     return score
 
 
-def scrape_privacy_scores(base_path: Path = PROJECT_ROOT) -> dict[str, dict]:
+def scrape_privacy_scores(base_path: Path = PROJECT_ROOT, use_cache: bool = True) -> dict[str, dict]:
     """Scrape privacy scores for all available manufacturers."""
     results: dict[str, dict] = {}
     apps = available_apps(base_path)
 
-    for manufacturer in apps:
-        url = MANUFACTURER_PNI_URLS.get(manufacturer)
-        if not url:
-            print(f"  Skipping {manufacturer}: no PNI URL configured")
-            continue
-
-        print(f"  Fetching {manufacturer}...")
-        html = fetch_pni_page(url)
+    targets = [(m, MANUFACTURER_PNI_URLS[m]) for m in apps if m in PNI_MANUFACTURERS]
+    if LOG.isEnabledFor(logging.INFO) and len(targets) < len(apps):
+        skipped = [m for m in apps if m not in PNI_MANUFACTURERS]
+        LOG.info("  Skipping %s: no PNI URL configured", ", ".join(skipped))
+    if not targets:
+        return results
+
+    # Fetches are network-bound, so overlap them on threads sharing one connection pool
+    pages: dict[str, str | None] = {}
+    with ThreadPoolExecutor(max_workers=min(len(targets), PNI_FETCH_WORKERS)) as executor:
+        futures = {}
+        for manufacturer, url in targets:
+            LOG.info("  Fetching %s...", manufacturer)
+            futures[executor.submit(fetch_pni_page, url, use_cache=use_cache)] = manufacturer
+        for future in as_completed(futures):
+            pages[futures[future]] = future.result()
+
+    # Parse on the main thread, in manufacturer order
+    for manufacturer, url in targets:
+        html = pages.get(manufacturer)
         if not html:
             continue
 
@@ -301,7 +442,7 @@ def scrape_privacy_scores(base_path: Path = PROJECT_ROOT) -> dict[str, dict]:
     return results
 
 
-def save_privacy_bar_chart(scores: Mapping[str, dict], output_path: Path) -> Path:
+def save_privacy_bar_chart(scores: Mapping[str, dict], output_path: Path, fig: Figure | None = None) -> Path:
     """Generate stacked bar chart of privacy scores by category."""
     if not scores:
         raise ValueError("No privacy scores provided")
@@ -315,37 +456,35 @@ def save_privacy_bar_chart(scores: Mapping[str, dict], output_path: Path) -> Pat
     category_labels = ["Data Collection", "Data Usage", "User Control", "Security", "Transparency"]
     category_colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
 
-    # Build values per category
-    values_by_cat = {cat: [scores[m]["score"][cat] for m in manufacturers] for cat in categories}
+    # Build values per category; each layer sits on the running total below it
+    vals_matrix = np.asarray([[scores[m]["score"][cat] for m in manufacturers] for cat in categories])
+    tops = vals_matrix.cumsum(axis=0)
+    bottoms = tops - vals_matrix
 
     x_positions = list(range(len(manufacturers)))
 
-    fig, ax = plt.subplots(figsize=(max(6, len(manufacturers) * 0.9), 5))
+    chart_fig, ax = reset_figure(fig, (max(6, len(manufacturers) * 0.9), 5))
 
     # Stacked bars
-    bottom = [0] * len(manufacturers)
-    for cat, label, color in zip(categories, category_labels, category_colors):
-        vals = values_by_cat[cat]
-        ax.bar(x_positions, vals, bottom=bottom, color=color, label=label)
-        bottom = [b + v for b, v in zip(bottom, vals)]
+    for idx, (label, color) in enumerate(zip(category_labels, category_colors)):
+        ax.bar(x_positions, vals_matrix[idx], bottom=bottoms[idx], color=color, label=label)
 
     # Add total score labels on top
     for i, m in enumerate(manufacturers):
         total = scores[m]["score"]["total"]
         grade = scores[m]["score"]["grade"]
-        ax.text(i, bottom[i] + 1, f"{total} ({grade})",
+        ax.text(i, tops[-1, i] + 1, f"{total} ({grade})",
                 ha='center', va='bottom', fontsize=9, fontweight='bold')
 
     ax.set_ylabel("Privacy Score")
     ax.set_title("Mozilla Privacy Not Included Scores by Manufacturer (by category)")
     ax.set_xticks(x_positions, manufacturers, rotation=45, ha="right")
-    max_value = max(bottom) if bottom else 0
+    max_value = tops[-1].max() if manufacturers else 0
     ax.set_ylim(0, max_value + 10)
     ax.grid(axis="y", linestyle="--", alpha=0.4)
     ax.legend(title="Category", bbox_to_anchor=(1.02, 1), loc="upper left")
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
 
@@ -384,18 +523,17 @@ def save_privacy_summary_csv(scores: Mapping[str, dict], output_path: Path) -> P
 def save_privacy_json(scores: Mapping[str, dict], output_path: Path) -> Path:
     """Save full privacy data to JSON."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(scores, f, indent=2)
+    output_path.write_bytes(orjson.dumps(scores, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     return output_path
 
 
-def generate_pni_report(base_path: Path = PROJECT_ROOT) -> Path | None:
+def generate_pni_report(base_path: Path = PROJECT_ROOT, use_cache: bool = True) -> Path | None:
     """Main entry point: scrape and generate PNI reports."""
-    print("Scraping Mozilla Privacy Not Included pages...")
-    scores = scrape_privacy_scores(base_path)
+    LOG.info("Scraping Mozilla Privacy Not Included pages...")
+    scores = scrape_privacy_scores(base_path, use_cache=use_cache)
 
     if not scores:
-        print("No PNI data collected")
+        LOG.info("No PNI data collected")
         return None
 
     PNI_DIR.mkdir(parents=True, exist_ok=True)
@@ -403,22 +541,29 @@ def generate_pni_report(base_path: Path = PROJECT_ROOT) -> Path | None:
     # Generate outputs
     chart_path = PNI_DIR / "pni_scores.png"
     save_privacy_bar_chart(scores, chart_path)
-    print(f"  Saved chart: {chart_path}")
+    LOG.info("  Saved chart: %s", chart_path)
 
     csv_path = PNI_DIR / "pni_summary.csv"
     save_privacy_summary_csv(scores, csv_path)
-    print(f"  Saved CSV: {csv_path}")
+    LOG.info("  Saved CSV: %s", csv_path)
 
     json_path = PNI_DIR / "pni_full.json"
     save_privacy_json(scores, json_path)
-    print(f"  Saved JSON: {json_path}")
+    LOG.info("  Saved JSON: %s", json_path)
 
     return chart_path
 
 
 if __name__ == "__main__":
-    path = generate_pni_report()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape Mozilla Privacy Not Included pages and generate PNI reports")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached pages and fetch every page again")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+    path = generate_pni_report(use_cache=not args.no_cache)
     if path:
-        print(f"\nPNI report generated successfully")
+        LOG.info("\nPNI report generated successfully")
     else:
-        print("Failed to generate PNI report")
+        LOG.info("Failed to generate PNI report")
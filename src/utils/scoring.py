@@ -1,9 +1,15 @@
 from collections import Counter
 from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
 
 RISK_LEVELS: tuple[str, ...] = ("high", "medium", "normal")
 RISK_WEIGHTS: Mapping[str, int] = {"high": 2, "medium": 1, "normal": 0}
-DEFAULT_STATUS_MAPPING: Mapping[str, str] = {
+# read-only, so map_to_risk can memoize lookups against it
+DEFAULT_STATUS_MAPPING: Mapping[str, str] = MappingProxyType({
     "dangerous": "high",
     "high": "high",
     "unknown": "medium",
@@ -12,18 +18,26 @@ DEFAULT_STATUS_MAPPING: Mapping[str, str] = {
     "secure": "normal",
     "info": "normal",
     "warning": "medium",
-}
+})
+_DEFAULT_WEIGHT_VECTOR = np.array([RISK_WEIGHTS[level] for level in RISK_LEVELS])
 
 def normalize_token(value: object) -> str:
-    if isinstance(value, str):
+    if type(value) is str:
         return value.strip().lower()
     return str(value).strip().lower()
 
+@lru_cache(maxsize=256)
+def _map_default_risk(value: str) -> str:
+    return DEFAULT_STATUS_MAPPING.get(value.strip().lower(), "normal")
+
 def map_to_risk(
     value: object,
     mapping: Mapping[str, str] = DEFAULT_STATUS_MAPPING,
     default: str = "normal",
 ) -> str:
+    # mappings are unhashable, so only the default vocabulary is memoized
+    if type(value) is str and mapping is DEFAULT_STATUS_MAPPING and default == "normal":
+        return _map_default_risk(value)
     token = normalize_token(value)
     return mapping.get(token, default)
 
@@ -41,18 +55,44 @@ def tally_risks(
         counts[level] += 1
     return dict(counts)
 
+def tally_risks_vectorized(
+    values: Iterable[object],
+    mapping: Mapping[str, str] = DEFAULT_STATUS_MAPPING,
+    levels: Iterable[str] = RISK_LEVELS,
+    default: str = "normal",
+) -> dict[str, int]:
+    # same counts as tally_risks in one pandas pass: a literal None is skipped,
+    # while NaN/NA are stringified like any other value and fall to default
+    series = pd.Series(values, dtype=object)
+    missing = series.isna().to_numpy()
+    if missing.any():
+        keep = ~missing
+        keep[missing] = [value is not None for value in series[missing]]
+        series = series[keep]
+    mapped = series.astype(str).str.strip().str.lower().map(mapping).fillna(default)
+    counts = {level: 0 for level in levels}
+    for level, count in mapped.value_counts(sort=False).items():
+        counts[level] = counts.get(level, 0) + int(count)
+    return counts
+
 def weighted_score(
     counts: Mapping[str, int],
     weights: Mapping[str, int] = RISK_WEIGHTS,
 ) -> int:
-    return sum(counts.get(level, 0) * weights.get(level, 0) for level in set(counts) | set(weights))
+    if weights is RISK_WEIGHTS:
+        return int(np.dot([counts.get(level, 0) for level in RISK_LEVELS], _DEFAULT_WEIGHT_VECTOR))
+    # levels missing from weights weigh nothing
+    return sum(counts.get(level, 0) * weight for level, weight in weights.items())
 
 def summarize_risks(
     values: Iterable[object],
     mapping: Mapping[str, str] = DEFAULT_STATUS_MAPPING,
     weights: Mapping[str, int] = RISK_WEIGHTS,
 ) -> dict[str, int | float]:
-    counts = tally_risks(values, mapping=mapping)
+    if isinstance(values, pd.Series):
+        counts = tally_risks_vectorized(values, mapping=mapping)
+    else:
+        counts = tally_risks(values, mapping=mapping)
     score = weighted_score(counts, weights=weights)
     return {
         **counts,
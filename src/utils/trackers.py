@@ -1,5 +1,6 @@
 from collections.abc import Mapping
 from pathlib import Path
+import logging
 import sys
 
 SRC_PATH = Path(__file__).resolve().parents[1]
@@ -8,10 +9,10 @@ if str(SRC_PATH) not in sys.path:
 
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import pandas as pd
+from matplotlib.figure import Figure
 
-from apps import available_apps
+from apps import iter_app_csvs
+from utils.charts import reset_figure, save_figure
 
 PROJECT_ROOT = SRC_PATH.parent
 GENERATED_ROOT = SRC_PATH / "generated"
@@ -19,22 +20,25 @@ TRACKERS_DIR = GENERATED_ROOT / "trackers"
 
 TRACKERS_CSV = "trackers.csv"
 
-def handle_score_trackers(dataframe: pd.DataFrame) -> int:
-    return len(dataframe)
+LOG = logging.getLogger(__name__)
+
+def count_csv_rows(csv_path: Path) -> int:
+    # one record per non-blank line, like pd.read_csv with skip_blank_lines.
+    # Quoted fields spanning several lines would be over-counted.
+    with open(csv_path, "rb") as f:
+        lines = sum(1 for line in f if line.strip())
+    return max(lines - 1, 0)  # minus the header
 
 def load_tracker_counts(base_path: Path = PROJECT_ROOT) -> dict[str, int]:
     counts: dict[str, int] = {}
-    for app in available_apps(base_path):
-        csv_path = base_path / app / TRACKERS_CSV
-        if not csv_path.exists():
-            continue
-        dataframe = pd.read_csv(csv_path)
-        counts[Path(app).name] = handle_score_trackers(dataframe)
+    for app, csv_path in iter_app_csvs(base_path, TRACKERS_CSV):
+        counts[app] = count_csv_rows(csv_path)
     return counts
 
 def save_tracker_bar_chart(
     counts: Mapping[str, int],
     output_path: Path,
+    fig: Figure | None = None,
 ) -> Path:
     if not counts:
         raise ValueError("No tracker counts provided")
@@ -47,7 +51,7 @@ def save_tracker_bar_chart(
     values = [counts[name] for name in manufacturers]
     x_positions = list(range(len(manufacturers)))
 
-    fig, ax = plt.subplots(figsize=(max(6, len(manufacturers) * 0.8), 4.5))
+    chart_fig, ax = reset_figure(fig, (max(6, len(manufacturers) * 0.8), 4.5))
     ax.bar(x_positions, values, color="#1f77b4")
     ax.set_ylabel("Tracker count")
     ax.set_title("Trackers detected per manufacturer")
@@ -56,9 +60,8 @@ def save_tracker_bar_chart(
     ax.set_ylim(0, max_value + 1)
     ax.set_yticks(range(0, max_value + 1, 1))
     ax.grid(axis="y", linestyle="--", alpha=0.4)
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=300)
-    plt.close(fig)
+    chart_fig.tight_layout()
+    save_figure(chart_fig, output_path)
     return output_path
 
 def generate_tracker_report(base_path: Path = PROJECT_ROOT) -> Path | None:
@@ -72,8 +75,9 @@ def generate_tracker_report(base_path: Path = PROJECT_ROOT) -> Path | None:
     return save_tracker_bar_chart(counts, output_path)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     path = generate_tracker_report()
     if path:
-        print(f"Saved tracker chart to {path}")
+        LOG.info("Saved tracker chart to %s", path)
     else:
-        print("No tracker data available to plot")
+        LOG.info("No tracker data available to plot")